@@ -532,34 +532,31 @@ class StegoProApp {
 
     async hideData(containerFile, dataFile, password, signal) {
         try {
-            // Process large files in chunks
-            const containerB64 = await this.fileToBase64Chunked(containerFile);
-            const secretB64 = await this.fileToBase64Chunked(dataFile);
             const originalFileName = dataFile.name;
             const fileExtension = originalFileName.includes('.') ?
                 originalFileName.split('.').pop() : 'bin';
+            // Files are sent as raw multipart parts - no base64 inflation
+            const formData = new FormData();
+            formData.append('container', containerFile);
+            formData.append('secret', dataFile);
+            formData.append('method', this.currentMethod);
+            formData.append('password', password);
+            formData.append('original_filename', originalFileName);
+            formData.append('file_extension', fileExtension);
             const response = await fetch('/api/hide', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    container: containerB64,
-                    secret: secretB64,
-                    method: this.currentMethod,
-                    password: password,
-                    original_filename: originalFileName,
-                    file_extension: fileExtension
-                }),
+                body: formData,
                 signal: signal
             });
             if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+                throw new Error(await this.readApiError(response));
             }
-            const result = await response.json();
-            if (!result.success) throw new Error(result.error);
+            const result = this.readStegoResult(response);
+            const stegoBlob = await response.blob();
             return {
                 success: true,
                 method: result.method,
-                stego_data: result.stego_data,
+                stego_blob: stegoBlob,
                 file_extension: result.file_extension,
                 originalSize: result.original_size,
                 hiddenSize: result.hidden_size,
@@ -572,25 +569,23 @@ class StegoProApp {
     }
     async extractData(stegoFile, password, signal) {
         try {
-            const stegoB64 = await this.fileToBase64Chunked(stegoFile);
+            const formData = new FormData();
+            formData.append('stego', stegoFile);
+            formData.append('password', password);
             const response = await fetch('/api/extract', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    stego: stegoB64,
-                    password: password
-                }),
+                body: formData,
                 signal: signal
             });
             if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+                throw new Error(await this.readApiError(response));
             }
-            const result = await response.json();
-            if (!result.success) throw new Error(result.error);
+            const result = this.readStegoResult(response);
+            const extractedBlob = await response.blob();
             return {
                 success: true,
                 method: result.method,
-                extracted_data: result.extracted_data,
+                extracted_blob: extractedBlob,
                 extractedSize: result.extracted_size,
                 original_filename: result.original_filename,
                 file_extension: result.file_extension
@@ -599,35 +594,19 @@ class StegoProApp {
             throw new Error(`Ошибка при извлечении данных: ${error.message}`);
         }
     }
-    fileToBase64(file) {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onload = () => resolve(reader.result.split(',')[1]);
-            reader.onerror = () => reject(new Error('Не удалось прочитать файл'));
-            reader.readAsDataURL(file);
-        });
+    // Result metadata comes in a header, the file itself is the response body
+    readStegoResult(response) {
+        const header = response.headers.get('X-Stego-Result');
+        return header ? JSON.parse(decodeURIComponent(header)) : {};
     }
-    
-    // Optimized base64 encoding for large files
-    async fileToBase64Chunked(file) {
-        const chunkSize = 1024 * 1024; // 1MB chunks
-        if (file.size < chunkSize) {
-            return this.fileToBase64(file);
+    async readApiError(response) {
+        try {
+            const result = await response.json();
+            if (result && result.error) return result.error;
+        } catch (e) {
+            // Not a JSON body - fall back to the status code
         }
-        
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onload = () => {
-                try {
-                    const base64 = reader.result.split(',')[1];
-                    resolve(base64);
-                } catch (e) {
-                    reject(new Error('Ошибка кодирования файла'));
-                }
-            };
-            reader.onerror = () => reject(new Error('Не удалось прочитать файл'));
-            reader.readAsDataURL(file);
-        });
+        return `HTTP error! status: ${response.status}`;
     }
     
     // Sanitize filename for security
@@ -688,7 +667,7 @@ class StegoProApp {
             } else {
                 stegoName += '_stego';
             }
-            const stegoBlob = this.base64ToBlob(result.stego_data, 'application/octet-stream');
+            const stegoBlob = result.stego_blob;
             const stegoUrl = this.createTrackedObjectURL(stegoBlob);
             html = `
                 <div class="text-center mb-6">
@@ -722,7 +701,7 @@ class StegoProApp {
                 </div>
             `;
             setTimeout(() => {
-                result.stego_data = null;
+                result.stego_blob = null;
             }, 1000);
         } else if (operation === 'extract') {
             let dataName = 'extracted_data.bin';
@@ -735,7 +714,7 @@ class StegoProApp {
                 fileExtension = result.file_extension;
             }
             const mimeType = this.getMimeType(fileExtension);
-            const dataBlob = this.base64ToBlob(result.extracted_data, mimeType);
+            const dataBlob = result.extracted_blob.slice(0, result.extracted_blob.size, mimeType);
             const dataUrl = this.createTrackedObjectURL(dataBlob);
             html = `
                 <div class="text-center mb-6">
@@ -768,7 +747,7 @@ class StegoProApp {
                 </div>
             `;
             setTimeout(() => {
-                result.extracted_data = null;
+                result.extracted_blob = null;
             }, 1000);
         }
         resultsContent.innerHTML = html;
@@ -788,26 +767,6 @@ class StegoProApp {
             });
         }, 100);
     }
-    base64ToBlob(base64, mimeType) {
-        try {
-            // Optimized for large files - process in larger chunks
-            const byteCharacters = atob(base64);
-            const byteArrays = [];
-            const chunkSize = 8192; // Larger chunks for better performance
-            
-            for (let offset = 0; offset < byteCharacters.length; offset += chunkSize) {
-                const slice = byteCharacters.slice(offset, offset + chunkSize);
-                const byteNumbers = new Uint8Array(slice.length);
-                for (let i = 0; i < slice.length; i++) {
-                    byteNumbers[i] = slice.charCodeAt(i);
-                }
-                byteArrays.push(byteNumbers);
-            }
-            return new Blob(byteArrays, { type: mimeType });
-        } catch (e) {
-            throw new Error('Ошибка декодирования данных: ' + e.message);
-        }
-    }
     getMimeType(extension) {
         const mimeTypes = {
             'txt': 'text/plain',
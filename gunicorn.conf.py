@@ -0,0 +1,21 @@
+# gunicorn.conf.py — настройки продакшн-сервера (см. Procfile)
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# Несколько процессов по числу ядер, в каждом пул потоков: запросы к БД и
+# OAuth перекрываются, а тяжёлая стеганография не блокирует весь процесс.
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = 1000
+
+# Большие контейнеры (до 50 МБ) обрабатываются дольше стандартных 30 секунд
+timeout = 120
+
+# Без preload: каждый воркер сам импортирует app.py после fork и открывает свой
+# пул соединений и фоновые потоки. С preload_app они создались бы в мастере и
+# достались бы воркерам общими (соединения) или мёртвыми (потоки).
+preload_app = False
@@ -1,25 +1,138 @@
-import base64
 import hashlib
 import io
+import logging
+import os
 import struct
+import threading
 import wave
-from typing import List
+import zlib
+from typing import Callable, Optional
 
 import numpy as np
+from cachetools import LRUCache
 from PIL import Image
 
+try:  # Optional: SIMD base64 for the JSON API, a drop-in for the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+logger = logging.getLogger(__name__)
+
 
 class StegoException(Exception):
     """Custom exception for steganography operations"""
     pass
 
 
+def _sha256(data) -> bytes:
+    """SHA256 digest of a bytes-like object without copying it.
+
+    The digest is an integrity check, not a security primitive, so the
+    OpenSSL implementation is requested with usedforsecurity=False (also
+    keeps FIPS-mode builds from refusing it).
+    """
+    digest = hashlib.new('sha256', usedforsecurity=False)
+    digest.update(memoryview(data))
+    return digest.digest()
+
+
+def _verify_integrity(stored_hash: bytes, calculated_hash: bytes) -> None:
+    """Reject extracted data whose digest does not match the one stored in the header"""
+    if stored_hash == calculated_hash:
+        return
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Hash mismatch - stored: %s..., calculated: %s...",
+                     stored_hash.hex()[:16], calculated_hash.hex()[:16])
+    raise StegoException("Integrity check failed: hidden data is corrupted")
+
+
+# Optional Numba kernel from stego_kernels, loaded on the first embed
+_UNLOADED = object()
+_hide_kernel = _UNLOADED
+
+
+def _load_hide_kernel():
+    """Return the Numba embed kernel, or None when numba is not installed"""
+    global _hide_kernel
+    if _hide_kernel is _UNLOADED:
+        try:
+            from stego_kernels import lsb_hide
+        except ImportError:  # Optional: the NumPy implementation is used without it
+            lsb_hide = None
+        _hide_kernel = lsb_hide
+    return _hide_kernel
+
+
+# Precompiled codecs: payload header sizes (data, filename) and the canonical WAV header
+_HDR = struct.Struct('>IH')
+_WAV_HEADER = struct.Struct('<4sL4s4sLHHLLHH4sL')
+
+_PAYLOAD_CHUNK = 256 * 1024  # Small enough to still be in L2 when it is hashed after the copy
+
+
+def _pack_payload(magic: bytes, secret_data: bytes, original_filename: str) -> bytearray:
+    """Build header + data in one preallocated buffer.
+
+    Layout: magic (4) | data size (>I) | filename length (>H) | filename | SHA256 (32) | data
+    """
+    filename_bytes = original_filename.encode('utf-8') if original_filename else b''
+    filename_end = 10 + len(filename_bytes)
+    data_start = filename_end + 32
+
+    payload = bytearray(data_start + len(secret_data))
+    payload[:4] = magic
+    _HDR.pack_into(payload, 4, len(secret_data), len(filename_bytes))
+    payload[10:filename_end] = filename_bytes
+    # Copy and hash the data in cache-sized chunks, so it is read from memory only once
+    digest = hashlib.new('sha256', usedforsecurity=False)
+    source, target = memoryview(secret_data), memoryview(payload)[data_start:]
+    for offset in range(0, len(source), _PAYLOAD_CHUNK):
+        chunk = source[offset:offset + _PAYLOAD_CHUNK]
+        target[offset:offset + len(chunk)] = chunk
+        digest.update(chunk)
+    payload[filename_end:data_start] = digest.digest()
+    return payload
+
+
+def _payload_rows(nbits: int, width: int) -> int:
+    """Number of pixel rows whose R, G, B values hold nbits, one bit per value"""
+    npix = -(-nbits // 3)
+    return -(-npix // width)
+
+
+def _embed_lsb(carrier: np.ndarray, data: bytes) -> None:
+    """Write the bits of data (MSB first) into the LSBs of the carrier, in place"""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    nbits = buffer.size * 8
+    if nbits > carrier.size:
+        raise StegoException("Not enough capacity in container")
+    kernel = _load_hide_kernel()
+    if kernel is not None:
+        kernel(carrier, buffer)
+    else:
+        carrier[:nbits] = (carrier[:nbits] & np.uint8(0xFE)) | np.unpackbits(buffer)
+
+
+def _extract_lsb(carrier: np.ndarray, nbytes: int) -> bytes:
+    """Read nbytes (MSB first) from the LSBs of the carrier"""
+    # np.packbits is already SIMD and beats a scalar Numba loop, so it is used either way
+    if nbytes * 8 > carrier.size:
+        raise StegoException("Not enough capacity in container")
+    return np.packbits(carrier[:nbytes * 8] & np.uint8(1)).tobytes()
+
+
 class LSBImageSteganography:
     """LSB (Least Significant Bit) steganography for images"""
 
     def __init__(self):
-        self.HEADER_SIZE = 128  # Increased for filename storage
         self.MAGIC_BYTES = b'STGO'  # Magic bytes for identification
+        self.FIXED_HEADER_SIZE = 10  # Magic + data size + filename length, in bytes
+        self.HASH_SIZE = 32  # SHA256 digest following the filename
+        # LSB-modified pixels barely compress, so zlib level 6 costs CPU for little gain
+        self.PNG_COMPRESS_LEVEL = 1
+        # Run-length matching only: LSB noise defeats long-distance matches, flat areas still shrink
+        self.PNG_COMPRESS_TYPE = zlib.Z_RLE
 
     def hide_data(self, image_data: bytes, secret_data: bytes, password: str = "",
                   original_filename: str = "") -> bytes:
@@ -36,36 +149,47 @@ class LSBImageSteganography:
             Modified image data with hidden information
         """
         try:
-            # Load image
+            # Load image (Image.open only parses the header, pixels are decoded lazily)
             image = Image.open(io.BytesIO(image_data))
 
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-
-            # Get pixel data
-            pixels = np.array(image)
-            flat_pixels = pixels.flatten()
-
             # Prepare data with header
             data_with_header = self._prepare_data(secret_data, password, original_filename)
 
-            # Check capacity
-            available_bits = len(flat_pixels) * 3  # 3 channels per pixel
-            required_bits = len(data_with_header) * 8 + self.HEADER_SIZE
+            # Check capacity from the dimensions before decoding: one bit per R, G, B value
+            available_bits = image.width * image.height * 3
+            required_bits = len(data_with_header) * 8
 
             if required_bits > available_bits:
                 raise StegoException("Image too small to hide data")
 
-            # Hide data using LSB
-            stego_pixels = self._hide_bits(flat_pixels, data_with_header)
+            # An uncompressed 24-bit BMP already is the pixel array: embed into the file itself
+            if image.format == 'BMP':
+                stego_bmp = self._hide_bmp(image_data, data_with_header, image.width, image.height)
+                if stego_bmp is not None:
+                    return stego_bmp
+
+            # Convert to RGB if necessary; RGBA is used as-is so transparency survives
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGB')
+            channels = len(image.mode)
+
+            # Only the rows the payload reaches are copied out as a flat writable buffer;
+            # the rest of the decoded image is never copied
+            rows = _payload_rows(required_bits, image.width)
+            shape = (rows, image.width, channels)
+            flat_pixels = np.frombuffer(bytearray(image.crop((0, 0, image.width, rows)).tobytes()), dtype=np.uint8)
 
-            # Reshape back to image dimensions
-            stego_image = stego_pixels.reshape(pixels.shape)
+            # Hide data using LSB (flat_pixels is our own copy, modified in place)
+            self._hide_bits(flat_pixels, data_with_header, channels)
 
-            # Save as PNG to avoid compression artifacts
+            # Put the modified rows back in place
+            image.paste(Image.fromarray(flat_pixels.reshape(shape)), (0, 0))
+
+            # Save as PNG to avoid compression artifacts; source metadata is not carried over
+            image.info = {}
             output = io.BytesIO()
-            Image.fromarray(stego_image.astype(np.uint8)).save(output, format='PNG')
+            image.save(output, format='PNG', compress_level=self.PNG_COMPRESS_LEVEL,
+                       compress_type=self.PNG_COMPRESS_TYPE)
 
             return output.getvalue()
 
@@ -87,123 +211,120 @@ class LSBImageSteganography:
             # Load image
             image = Image.open(io.BytesIO(stego_image_data))
 
-            if image.mode != 'RGB':
+            if image.mode not in ('RGB', 'RGBA'):
                 image = image.convert('RGB')
+            channels = len(image.mode)
 
-            # Get pixel data
-            pixels = np.array(image)
-            flat_pixels = pixels.flatten()
+            # Get pixel data; a read-only view is enough since only LSBs are read
+            flat_pixels = np.frombuffer(image.tobytes(), dtype=np.uint8)
+            capacity = flat_pixels.size // channels * 3
 
-            # Extract header first
-            header_bits = self._extract_bits(flat_pixels, self.HEADER_SIZE)
-            header_bytes = self._bits_to_bytes(header_bits)
+            # Extract fixed part of the header first (MSB-first, as written by np.unpackbits)
+            if capacity < self.FIXED_HEADER_SIZE * 8:
+                raise StegoException("No hidden data found or invalid format")
+            header_bytes = _extract_lsb(
+                self._color_values(flat_pixels, channels, self.FIXED_HEADER_SIZE * 8),
+                self.FIXED_HEADER_SIZE
+            )
 
             # Verify magic bytes
             if header_bytes[:4] != self.MAGIC_BYTES:
                 raise StegoException("No hidden data found or invalid format")
 
-            # Extract data size and filename
-            data_size = struct.unpack('>I', header_bytes[4:8])[0]
+            # Extract data size and filename length
+            data_size, filename_length = _HDR.unpack_from(header_bytes, 4)
 
-            # Extract filename length and filename
-            filename_length = struct.unpack('>H', header_bytes[8:10])[0]
-            original_filename = ""
-            if filename_length > 0:
-                original_filename = header_bytes[10:10 + filename_length].decode('utf-8', errors='ignore')
+            # Full header is magic + sizes + filename + hash; data follows right after it
+            data_start = self.FIXED_HEADER_SIZE + filename_length + self.HASH_SIZE
+            total_bits = (data_start + data_size) * 8
+            if total_bits > capacity:
+                raise StegoException("Hidden data size exceeds image capacity")
 
-            # Extract actual data
-            total_bits = self.HEADER_SIZE + (data_size * 8)
-            all_bits = self._extract_bits(flat_pixels, total_bits)
-            data_bits = all_bits[self.HEADER_SIZE:]
+            # One view over the whole bit region: the rest of the header (filename + hash)
+            # continues after the fixed part, the data follows in its own bit range,
+            # so no bit is unpacked twice and the payload is not sliced out of a larger buffer
+            values = self._color_values(flat_pixels, channels, total_bits)
+            header_tail = _extract_lsb(values[self.FIXED_HEADER_SIZE * 8:], data_start - self.FIXED_HEADER_SIZE)
+            extracted_data = _extract_lsb(values[data_start * 8:], data_size)
 
-            # Convert to bytes - ensure we get exactly data_size bytes
-            extracted_data = self._bits_to_bytes(data_bits)
-            extracted_data = extracted_data[:data_size]  # Truncate to exact size
+            original_filename = ""
+            if filename_length > 0:
+                original_filename = header_tail[:filename_length].decode('utf-8', errors='ignore')
 
             # Verify integrity
-            stored_hash_start = 10 + filename_length
-            stored_hash = header_bytes[stored_hash_start:stored_hash_start + 32]  # 32 bytes for SHA256
-            calculated_hash = hashlib.sha256(extracted_data).digest()
-
-            if stored_hash != calculated_hash:
-                print(
-                    f"WARNING: Hash mismatch - stored: {stored_hash.hex()[:16]}..., calculated: {calculated_hash.hex()[:16]}...")
+            stored_hash = header_tail[filename_length:]
+            _verify_integrity(stored_hash, _sha256(extracted_data))
 
             return extracted_data, original_filename
 
         except Exception as e:
             raise StegoException(f"Failed to extract data: {str(e)}")
 
-    def _prepare_data(self, secret_data: bytes, password: str, original_filename: str) -> bytes:
+    def _prepare_data(self, secret_data: bytes, password: str, original_filename: str) -> bytearray:
         """Prepare data with header and integrity check"""
-        # Calculate data hash
-        data_hash = hashlib.sha256(secret_data).digest()
-
-        # Prepare filename
-        filename_bytes = original_filename.encode('utf-8') if original_filename else b''
-        filename_length = len(filename_bytes)
-
-        # Create header with filename support
-        data_size = len(secret_data)
-        header = (self.MAGIC_BYTES +
-                  struct.pack('>I', data_size) +
-                  struct.pack('>H', filename_length) +
-                  filename_bytes +
-                  data_hash)
-
-        # Pad header to fixed size
-        header = header.ljust(self.HEADER_SIZE // 8, b'\x00')
-
-        return header + secret_data
-
-    def _hide_bits(self, pixels: np.ndarray, data: bytes) -> np.ndarray:
-        """Hide data bits in LSB of pixels"""
-        stego_pixels = pixels.copy()
-        data_bits = self._bytes_to_bits(data)
-
-        bit_index = 0
-        for i in range(len(stego_pixels)):
-            if bit_index < len(data_bits):
-                # Clear LSB and set new bit
-                stego_pixels[i] = (stego_pixels[i] & 0xFE) | data_bits[bit_index]
-                bit_index += 1
-            else:
-                break
-
-        return stego_pixels
-
-    def _extract_bits(self, pixels: np.ndarray, num_bits: int) -> List[int]:
-        """Extract bits from LSB of pixels"""
-        bits = []
-        for i in range(min(num_bits, len(pixels))):
-            bits.append(pixels[i] & 1)
-        return bits
-
-    def _bytes_to_bits(self, data: bytes) -> List[int]:
-        """Convert bytes to list of bits"""
-        bits = []
-        for byte in data:
-            for i in range(8):
-                bits.append((byte >> (7 - i)) & 1)
-        return bits
-
-    def _bits_to_bytes(self, bits: List[int]) -> bytes:
-        """Convert list of bits to bytes"""
-        bytes_data = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(min(8, len(bits) - i)):
-                byte = (byte << 1) | bits[i + j]
-            bytes_data.append(byte)
-        return bytes(bytes_data)
+        return _pack_payload(self.MAGIC_BYTES, secret_data, original_filename)
+
+    def _hide_bmp(self, image_data: bytes, data: bytes, width: int, height: int) -> Optional[bytearray]:
+        """Hide data directly in the pixel array of an uncompressed 24-bit BMP.
+
+        Rows are stored bottom-up (unless the height is negative), padded to
+        4 bytes, with BGR values; a view in PIL's top-down RGB order keeps the
+        embedding identical to a decoded image, so extraction is unchanged.
+        Returns the stego BMP, or None for other BMP variants.
+        """
+        pixel_offset = struct.unpack_from('<I', image_data, 10)[0]
+        header_size, = struct.unpack_from('<I', image_data, 14)
+        if header_size < 40:  # OS/2 BITMAPCOREHEADER
+            return None
+        stored_height, = struct.unpack_from('<i', image_data, 22)
+        bits_per_pixel, compression = struct.unpack_from('<HI', image_data, 28)
+        stride = (width * 3 + 3) & ~3
+        if bits_per_pixel != 24 or compression != 0 or len(image_data) < pixel_offset + stride * height:
+            return None
+
+        output = bytearray(image_data)
+        rows = np.frombuffer(output, dtype=np.uint8, count=stride * height, offset=pixel_offset)
+        pixels = rows.reshape(height, stride)[:, :width * 3].reshape(height, width, 3)[:, :, ::-1]
+        if stored_height > 0:
+            pixels = pixels[::-1]
+
+        # Gather the R, G, B values of the rows the payload reaches, embed, scatter back
+        touched = pixels[:_payload_rows(len(data) * 8, width)]
+        values = touched.reshape(-1)
+        _embed_lsb(values, data)
+        touched[...] = values.reshape(touched.shape)
+        return output
+
+    def _color_values(self, flat_pixels: np.ndarray, channels: int, count: int) -> np.ndarray:
+        """First count R, G, B values in pixel order; alpha bytes of RGBA pixels are skipped"""
+        if channels == 3:
+            return flat_pixels[:count]
+        npix = -(-count // 3)
+        return flat_pixels[:npix * channels].reshape(npix, channels)[:, :3].reshape(-1)
+
+    def _hide_bits(self, pixels_inout: np.ndarray, data: bytes, channels: int = 3) -> None:
+        """Hide data bits in LSB of pixels, mutating the array in place"""
+        if channels == 3:
+            _embed_lsb(pixels_inout, data)
+            return
+
+        # RGBA: gather the R, G, B values of the pixels the payload needs, embed,
+        # then scatter them back; alpha is left untouched
+        npix = -(-len(data) * 8 // 3)
+        rgb = pixels_inout[:npix * channels].reshape(npix, channels)[:, :3]
+        values = rgb.reshape(-1)
+        _embed_lsb(values, data)
+        rgb[...] = values.reshape(npix, 3)
 
 
 class LSBAudioSteganography:
     """LSB steganography for WAV audio files with stereo support"""
 
     def __init__(self):
-        self.HEADER_SIZE = 128  # Increased for filename storage
         self.MAGIC_BYTES = b'STGA'  # Magic bytes for audio
+        self.FIXED_HEADER_SIZE = 10  # Magic + data size + filename length, in bytes
+        self.HASH_SIZE = 32  # SHA256 digest following the filename
+        self.WAV_HEADER_SIZE = _WAV_HEADER.size  # Canonical 44-byte RIFF/fmt/data header written by _write_wav
 
     def hide_data(self, audio_data: bytes, secret_data: bytes, password: str = "",
                   original_filename: str = "") -> bytes:
@@ -211,37 +332,30 @@ class LSBAudioSteganography:
         Hide secret data in WAV audio file using LSB with stereo support
         """
         try:
+            # Prepare data with header
+            data_with_header = self._prepare_data(secret_data, password, original_filename)
+
             # Parse WAV file
             with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
                 params = wav_file.getparams()
-                frames = wav_file.readframes(wav_file.getnframes())
 
-            # Convert to byte array for manipulation
-            frames_array = bytearray(frames)
+                # Calculate available capacity from the header before reading any frames
+                available_bits = self._calculate_audio_capacity(
+                    params.nframes * params.nchannels * params.sampwidth, params)
+                required_bits = len(data_with_header) * 8
 
-            # Prepare data with header
-            data_with_header = self._prepare_data(secret_data, password, original_filename)
+                if required_bits > available_bits:
+                    raise StegoException("Audio file too small to hide data")
 
-            # Convert data to bits
-            data_bits = self._bytes_to_bits(data_with_header)
+                frames = wav_file.readframes(params.nframes)
 
-            # Calculate available capacity considering stereo
-            available_bits = self._calculate_audio_capacity(frames_array, params)
-            required_bits = len(data_bits)
+            # Create the new WAV file: the frames are copied once, straight behind its header
+            stego_wav = self._write_wav(frames, params)
 
-            if required_bits > available_bits:
-                raise StegoException("Audio file too small to hide data")
+            # Hide data in LSB with stereo consideration, in place inside the output file
+            self._hide_audio_bits(memoryview(stego_wav)[self.WAV_HEADER_SIZE:], data_with_header, params)
 
-            # Hide data in LSB with stereo consideration
-            self._hide_audio_bits(frames_array, data_bits, params)
-
-            # Create new WAV file
-            output = io.BytesIO()
-            with wave.open(output, 'wb') as wav_file:
-                wav_file.setparams(params)
-                wav_file.writeframes(bytes(frames_array))
-
-            return output.getvalue()
+            return stego_wav
 
         except Exception as e:
             raise StegoException(f"Failed to hide data in audio: {str(e)}")
@@ -256,229 +370,157 @@ class LSBAudioSteganography:
                 params = wav_file.getparams()
                 frames = wav_file.readframes(wav_file.getnframes())
 
-            # Convert to byte array for extraction
-            frames_array = bytearray(frames)
-
-            # Extract header bits
-            header_bits_len = self.HEADER_SIZE
-            if len(frames_array) < header_bits_len:
+            # Extraction only reads LSBs, so the frames are used as-is without a copy
+            # Extract fixed part of the header bits
+            header_bits_len = self.FIXED_HEADER_SIZE * 8
+            capacity = self._calculate_audio_capacity(len(frames), params)
+            if capacity < header_bits_len:
                 raise StegoException("Недостаточно данных для заголовка.")
 
-            header_bits = self._extract_audio_bits(frames_array, header_bits_len, params)
-            header_bytes = self._bits_to_bytes(header_bits)
+            # The carrier view is picked once per file from its params and reused for every read
+            carrier = self._audio_carrier(frames, params)
+            header_bytes = _extract_lsb(carrier, self.FIXED_HEADER_SIZE)
 
             # Verify magic bytes
             if header_bytes[:4] != self.MAGIC_BYTES:
                 raise StegoException("No hidden audio data found or invalid format")
 
-            # Extract data size and filename
-            data_size = struct.unpack('>I', header_bytes[4:8])[0]
-
-            # Extract filename length and filename
-            filename_length = struct.unpack('>H', header_bytes[8:10])[0]
-            original_filename = ""
-            if filename_length > 0:
-                original_filename = header_bytes[10:10 + filename_length].decode('utf-8', errors='ignore')
-
-            # Calculate total bits needed
-            total_bits_needed = header_bits_len + (data_size * 8)
+            # Extract data size and filename length
+            data_size, filename_length = _HDR.unpack_from(header_bytes, 4)
 
-            # Extract all bits
-            all_bits = self._extract_audio_bits(frames_array, total_bits_needed, params)
+            # Full header is magic + sizes + filename + hash; data follows right after it
+            data_start = self.FIXED_HEADER_SIZE + filename_length + self.HASH_SIZE
+            total_bits_needed = (data_start + data_size) * 8
+            if total_bits_needed > capacity:
+                raise StegoException("Hidden data size exceeds audio capacity")
 
-            # Get only data bits (skip header)
-            data_bits = all_bits[header_bits_len:]
+            # The rest of the header (filename + hash) continues after the fixed part,
+            # the data follows in its own bit range, so no sample is read twice
+            header_tail = _extract_lsb(carrier[self.FIXED_HEADER_SIZE * 8:], data_start - self.FIXED_HEADER_SIZE)
+            extracted_data = _extract_lsb(carrier[data_start * 8:], data_size)
 
-            # Convert bits to bytes
-            extracted_data = self._bits_to_bytes(data_bits)
-            extracted_data = extracted_data[:data_size]  # Truncate to exact size
+            original_filename = ""
+            if filename_length > 0:
+                original_filename = header_tail[:filename_length].decode('utf-8', errors='ignore')
 
             # Verify integrity
-            stored_hash_start = 10 + filename_length
-            stored_hash = header_bytes[stored_hash_start:stored_hash_start + 32]
-            calculated_hash = hashlib.sha256(extracted_data).digest()
-
-            if stored_hash != calculated_hash:
-                print(
-                    f"WARNING: Hash mismatch - stored: {stored_hash.hex()[:16]}..., calculated: {calculated_hash.hex()[:16]}...")
+            stored_hash = header_tail[filename_length:]
+            _verify_integrity(stored_hash, _sha256(extracted_data))
 
             return extracted_data, original_filename
 
         except Exception as e:
             raise StegoException(f"Failed to extract audio data: {str(e)}")
 
-    def _calculate_audio_capacity(self, frames_array: bytearray, params) -> int:
-        """Calculate available bits considering stereo configuration"""
-        nchannels = params.nchannels
-        sampwidth = params.sampwidth
-
-        if nchannels == 1:
-            # Mono: use all bytes
-            return len(frames_array)
-        elif nchannels == 2:
-            # Stereo: use only left channel to minimize distortion
-            # For 16-bit stereo, use every 4th byte (left channel low byte)
-            if sampwidth == 2:
-                return len(frames_array) // 4
-            else:
-                # For 8-bit stereo, use every 2nd byte
-                return len(frames_array) // 2
-        else:
-            # Multi-channel: use only first channel
-            return len(frames_array) // nchannels
-
-    def _hide_audio_bits(self, frames_array: bytearray, data_bits: list, params):
-        """Hide bits in audio data considering stereo configuration"""
-        nchannels = params.nchannels
-        sampwidth = params.sampwidth
-
-        bit_index = 0
-        data_length = len(data_bits)
-
-        if nchannels == 1:
-            # Mono: use all bytes
-            for i in range(len(frames_array)):
-                if bit_index >= data_length:
-                    break
-                frames_array[i] = (frames_array[i] & 0xFE) | data_bits[bit_index]
-                bit_index += 1
-
-        elif nchannels == 2 and sampwidth == 2:
-            # 16-bit stereo: use only left channel low bytes (every 4th byte starting from 0)
-            for i in range(0, len(frames_array), 4):
-                if bit_index >= data_length:
-                    break
-                # Use the low byte of left channel (position i)
-                frames_array[i] = (frames_array[i] & 0xFE) | data_bits[bit_index]
-                bit_index += 1
-
-        elif nchannels == 2:
-            # 8-bit stereo: use only left channel (every 2nd byte)
-            for i in range(0, len(frames_array), 2):
-                if bit_index >= data_length:
-                    break
-                frames_array[i] = (frames_array[i] & 0xFE) | data_bits[bit_index]
-                bit_index += 1
-
-        else:
-            # Multi-channel: use only first channel
-            bytes_per_sample = nchannels * sampwidth
-            for i in range(0, len(frames_array), bytes_per_sample):
-                if bit_index >= data_length:
-                    break
-                # Use first byte of first channel
-                frames_array[i] = (frames_array[i] & 0xFE) | data_bits[bit_index]
-                bit_index += 1
-
-    def _extract_audio_bits(self, frames_array: bytearray, num_bits: int, params) -> list:
-        """Extract bits from audio data considering stereo configuration"""
-        nchannels = params.nchannels
-        sampwidth = params.sampwidth
-        bits = []
-
-        if nchannels == 1:
-            # Mono: extract from all bytes
-            for i in range(min(num_bits, len(frames_array))):
-                bits.append(frames_array[i] & 1)
-
-        elif nchannels == 2 and sampwidth == 2:
-            # 16-bit stereo: extract from left channel low bytes
-            for i in range(0, min(num_bits * 4, len(frames_array)), 4):
-                if len(bits) >= num_bits:
-                    break
-                bits.append(frames_array[i] & 1)
-
-        elif nchannels == 2:
-            # 8-bit stereo: extract from left channel
-            for i in range(0, min(num_bits * 2, len(frames_array)), 2):
-                if len(bits) >= num_bits:
-                    break
-                bits.append(frames_array[i] & 1)
-
-        else:
-            # Multi-channel: extract from first channel
-            bytes_per_sample = nchannels * sampwidth
-            for i in range(0, min(num_bits * bytes_per_sample, len(frames_array)), bytes_per_sample):
-                if len(bits) >= num_bits:
-                    break
-                bits.append(frames_array[i] & 1)
-
-        return bits[:num_bits]
-
-    def _prepare_data(self, secret_data: bytes, password: str, original_filename: str) -> bytes:
+    def _sample_stride(self, params) -> int:
+        """Distance in bytes between carrier bytes.
+
+        Mono uses every byte; 16-bit stereo and multi-channel files use only
+        the low byte of the first channel, i.e. the first byte of every frame.
+        Other stereo widths use every 2nd byte, as files hidden by earlier
+        versions were written that way.
+        """
+        if params.nchannels == 1:
+            return 1
+        if params.nchannels == 2 and params.sampwidth != 2:
+            return 2
+        return params.nchannels * params.sampwidth
+
+    def _write_wav(self, frames: bytes, params) -> bytearray:
+        """Serialize PCM frames with the same canonical 44-byte header wave.Wave_write emits"""
+        nchannels, sampwidth, framerate = params.nchannels, params.sampwidth, params.framerate
+        output = bytearray(self.WAV_HEADER_SIZE + len(frames))
+        _WAV_HEADER.pack_into(output, 0,
+                              b'RIFF', 36 + len(frames), b'WAVE', b'fmt ', 16,
+                              1,  # WAVE_FORMAT_PCM
+                              nchannels, framerate, nchannels * framerate * sampwidth,
+                              nchannels * sampwidth, sampwidth * 8, b'data', len(frames))
+        output[self.WAV_HEADER_SIZE:] = frames
+        return output
+
+    def _calculate_audio_capacity(self, frames_size: int, params) -> int:
+        """Calculate available bits in frames_size bytes of audio considering stereo configuration"""
+        return frames_size // self._sample_stride(params)
+
+    def _audio_carrier(self, frames_array, params) -> np.ndarray:
+        """Strided view over the carrier bytes (writable for a bytearray or a view of one)"""
+        return np.frombuffer(frames_array, dtype=np.uint8)[::self._sample_stride(params)]
+
+    def _hide_audio_bits(self, frames_array, data: bytes, params):
+        """Hide data bits in audio data considering stereo configuration, in place"""
+        _embed_lsb(self._audio_carrier(frames_array, params), data)
+
+    def _prepare_data(self, secret_data: bytes, password: str, original_filename: str) -> bytearray:
         """Prepare data with header and integrity check"""
-        data_hash = hashlib.sha256(secret_data).digest()
-
-        # Prepare filename
-        filename_bytes = original_filename.encode('utf-8') if original_filename else b''
-        filename_length = len(filename_bytes)
-
-        data_size = len(secret_data)
-        header = (self.MAGIC_BYTES +
-                  struct.pack('>I', data_size) +
-                  struct.pack('>H', filename_length) +
-                  filename_bytes +
-                  data_hash)
-        header = header.ljust(self.HEADER_SIZE // 8, b'\x00')
-        return header + secret_data
-
-    def _bytes_to_bits(self, data: bytes) -> list:
-        """Convert bytes to list of bits"""
-        bits = []
-        for byte in data:
-            for i in range(8):
-                bits.append((byte >> (7 - i)) & 1)
-        return bits
-
-    def _bits_to_bytes(self, bits: list) -> bytes:
-        """Convert list of bits to bytes"""
-        bytes_data = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(min(8, len(bits) - i)):
-                byte = (byte << 1) | bits[i + j]
-            bytes_data.append(byte)
-        return bytes(bytes_data)
+        return _pack_payload(self.MAGIC_BYTES, secret_data, original_filename)
 
 
 class StegoProBackend:
+    OUTPUT_EXTENSIONS = {'lsb': '.png', 'audio_lsb': '.wav'}
 
     def __init__(self):
         self.image_stego = LSBImageSteganography()
         self.audio_stego = LSBAudioSteganography()
 
-    def process_hide_request(self, container_data: bytes, secret_data: bytes,
-                             method: str, password: str = "", original_filename: str = "",
-                             file_extension: str = "") -> dict:
+    def hide_bytes(self, container_data: bytes, secret_data: bytes, method: str,
+                   password: str = "", original_filename: str = "") -> bytes:
         """
-        Process hide data request
+        Hide secret data in a container
         Args:
             container_data: Container file data
             secret_data: Data to hide
             method: Steganography method ('lsb' or 'audio_lsb')
             password: Optional password
             original_filename: Original filename to preserve
-            file_extension: Original file extension
         Returns:
-            Dictionary with result information
+            Raw stego file data (PNG, BMP for BMP containers, or WAV)
         """
-        try:
-            if method == 'lsb':
-                stego_data = self.image_stego.hide_data(container_data, secret_data, password, original_filename)
-                output_extension = '.png'
-            elif method == 'audio_lsb':
-                stego_data = self.audio_stego.hide_data(container_data, secret_data, password, original_filename)
-                output_extension = '.wav'
-            else:
-                raise StegoException(f"Unsupported method: {method}")
+        if method == 'lsb':
+            return self.image_stego.hide_data(container_data, secret_data, password, original_filename)
+        if method == 'audio_lsb':
+            return self.audio_stego.hide_data(container_data, secret_data, password, original_filename)
+        raise StegoException(f"Unsupported method: {method}")
 
-            # Encode to base64 for web transfer
-            stego_base64 = base64.b64encode(stego_data).decode('utf-8')
+    def extract_bytes(self, stego_data: bytes, method: str, password: str = "") -> tuple:
+        """
+        Extract hidden data from a stego file
+        Returns:
+            Tuple of (extracted_data, original_filename, detected_method)
+        """
+        if method not in self.OUTPUT_EXTENSIONS:
+            # Auto-detect method from the container's magic bytes
+            method = self.detect_method(stego_data)
+
+        if method == 'audio_lsb':
+            return self.audio_stego.extract_data(stego_data, password) + (method,)
+        return self.image_stego.extract_data(stego_data, password) + (method,)
+
+    @staticmethod
+    def detect_method(data: bytes) -> str:
+        """Pick the decoder from the file signature instead of trial decoding"""
+        if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+            return 'audio_lsb'
+        # PNG, BMP, TIFF and anything else Pillow may open go to the image decoder,
+        # whose own error is reported if the file is not an image either
+        return 'lsb'
+
+    def output_extension(self, stego_data: bytes, method: str) -> str:
+        """Extension of the produced stego file; BMP containers are written back as BMP"""
+        if method == 'lsb' and stego_data[:2] == b'BM':
+            return '.bmp'
+        return self.OUTPUT_EXTENSIONS[method]
+
+    def hide_result(self, container_data: bytes, secret_data: bytes,
+                    method: str, password: str = "", original_filename: str = "",
+                    file_extension: str = "") -> dict:
+        """Run hide_bytes and describe the outcome; stego_data holds raw bytes"""
+        try:
+            stego_data = self.hide_bytes(container_data, secret_data, method, password, original_filename)
             return {
                 'success': True,
                 'method': method,
-                'stego_data': stego_base64,
-                'file_extension': output_extension,
+                'stego_data': stego_data,
+                'file_extension': self.output_extension(stego_data, method),
                 'original_size': len(container_data),
                 'hidden_size': len(secret_data),
                 'stego_size': len(stego_data),
@@ -490,41 +532,19 @@ class StegoProBackend:
                 'error': str(e)
             }
 
-    def process_extract_request(self, stego_data: bytes, method: str,
-                                password: str = "") -> dict:
-
+    def extract_result(self, stego_data: bytes, method: str, password: str = "") -> dict:
+        """Run extract_bytes and describe the outcome; extracted_data holds raw bytes"""
         try:
-            extracted_data = None
-            original_filename = ""
-            detected_method = method
-
-            if method == 'lsb':
-                extracted_data, original_filename = self.image_stego.extract_data(stego_data, password)
-            elif method == 'audio_lsb':
-                extracted_data, original_filename = self.audio_stego.extract_data(stego_data, password)
-            else:
-                # Auto-detect method
-                try:
-                    extracted_data, original_filename = self.image_stego.extract_data(stego_data, password)
-                    detected_method = 'lsb'
-                except Exception as e1:
-                    try:
-                        extracted_data, original_filename = self.audio_stego.extract_data(stego_data, password)
-                        detected_method = 'audio_lsb'
-                    except Exception as e2:
-                        raise StegoException(f"Auto-detection failed: Image - {e1}, Audio - {e2}")
+            extracted_data, original_filename, detected_method = self.extract_bytes(stego_data, method, password)
 
             # Determine file extension from original filename
             file_extension = 'bin'
             if original_filename and '.' in original_filename:
                 file_extension = original_filename.split('.')[-1]
 
-            # Encode to base64
-            data_base64 = base64.b64encode(extracted_data).decode('utf-8')
-
             return {
                 'success': True,
-                'extracted_data': data_base64,
+                'extracted_data': extracted_data,
                 'method': detected_method,
                 'extracted_size': len(extracted_data),
                 'original_filename': original_filename,
@@ -537,6 +557,19 @@ class StegoProBackend:
                 'error': str(e)
             }
 
+    def process_hide_request(self, container_data: bytes, secret_data: bytes,
+                             method: str, password: str = "", original_filename: str = "",
+                             file_extension: str = "") -> dict:
+        """Process hide data request; stego_data is base64 for JSON transfer"""
+        return _encode_result(
+            self.hide_result(container_data, secret_data, method, password, original_filename, file_extension),
+            'stego_data'
+        )
+
+    def process_extract_request(self, stego_data: bytes, method: str, password: str = "") -> dict:
+        """Process extract data request; extracted_data is base64 for JSON transfer"""
+        return _encode_result(self.extract_result(stego_data, method, password), 'extracted_data')
+
     def get_file_info(self, file_data: bytes, filename: str) -> dict:
         """Get file information for frontend"""
         try:
@@ -556,17 +589,18 @@ class StegoProBackend:
             elif file_extension == 'wav':
                 with wave.open(io.BytesIO(file_data), 'rb') as wav_file:
                     params = wav_file.getparams()
+                    # Capacity follows from the header alone, no frame has to be read
                     capacity = self.audio_stego._calculate_audio_capacity(
-                        bytearray(wav_file.readframes(wav_file.getnframes())),
+                        params.nframes * params.nchannels * params.sampwidth,
                         params
                     )
                     return {
                         'type': 'audio',
                         'format': 'WAV',
                         'size': len(file_data),
-                        'channels': wav_file.getnchannels(),
-                        'sample_rate': wav_file.getframerate(),
-                        'duration': wav_file.getnframes() / wav_file.getframerate(),
+                        'channels': params.nchannels,
+                        'sample_rate': params.framerate,
+                        'duration': params.nframes / params.framerate,
                         'capacity_estimate': capacity // 8  # Convert bits to bytes
                     }
             else:
@@ -581,50 +615,150 @@ class StegoProBackend:
             }
 
 
-# Global backend instance
-backend = StegoProBackend()
+# Backend instance, created on first use
+_backend = None
+
+
+def _get_backend() -> StegoProBackend:
+    global _backend
+    if _backend is None:
+        _backend = StegoProBackend()
+    return _backend
+
+
+# Memoization of repeated hide and file-info requests (same cover re-submitted).
+# Keys hold blake2b digests of the inputs and password rather than the values
+# themselves; the cache is bounded by the total size of the stored results.
+# Stego outputs carry the user's secret, so the cache is off unless
+# STEGO_RESULT_CACHE_BYTES sets a size; extract results are never cached.
+RESULT_CACHE_BYTES = int(os.environ.get('STEGO_RESULT_CACHE_BYTES', 0))
+
+
+def _result_size(result: dict) -> int:
+    return sum(len(value) for value in result.values() if isinstance(value, (str, bytes, bytearray))) + 1
+
+
+_result_cache = LRUCache(maxsize=max(RESULT_CACHE_BYTES, 1), getsizeof=_result_size)
+_result_cache_lock = threading.Lock()
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _memoized(key: tuple, compute: Callable[[], dict]) -> dict:
+    """Return a cached copy of a previous result or compute and cache a successful one"""
+    if not RESULT_CACHE_BYTES:
+        return compute()
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    result = compute()
+    if 'error' not in result and _result_size(result) <= _result_cache.maxsize:
+        with _result_cache_lock:
+            _result_cache[key] = dict(result)
+    return result
+
+
+def _encode_result(result: dict, field: str) -> dict:
+    """Copy of a result with its binary field encoded to base64 for JSON transfer"""
+    if not result.get('success'):
+        return result
+    encoded = dict(result)
+    encoded[field] = base64.b64encode(memoryview(result[field])).decode('ascii')
+    return encoded
 
 
 # Flask-like interface for the backend
+def _read_input(source) -> bytes:
+    """Read raw bytes from a binary file-like object or decode a base64 string"""
+    if hasattr(source, 'read'):
+        return source.read()
+    return base64.b64decode(source)
+
+
+def _read_raw(source) -> bytes:
+    """Read raw bytes from a binary file-like object or pass bytes through"""
+    if hasattr(source, 'read'):
+        return source.read()
+    return bytes(source)
+
+
+def hide_file(container, secret, method: str, password: str = "",
+              original_filename: str = "", file_extension: str = "") -> dict:
+    """Process hide request with raw inputs (bytes or binary file-like objects)
+
+    Used for multipart uploads; stego_data in the result is raw bytes.
+    """
+    try:
+        container_data = _read_raw(container)
+        secret_data = _read_raw(secret)
+
+        key = ('hide', _digest(container_data), _digest(secret_data), method,
+               _digest(password.encode()), original_filename)
+        return _memoized(key, lambda: _get_backend().hide_result(
+            container_data, secret_data, method, password, original_filename, file_extension))
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Processing error: {str(e)}"
+        }
+
+
+def extract_file(stego, password: str = "") -> dict:
+    """Process extract request with raw input; extracted_data in the result is raw bytes"""
+    try:
+        stego_data = _read_raw(stego)
+
+        # Try to auto-detect method; the recovered plaintext is not memoized
+        return _get_backend().extract_result(stego_data, 'auto', password)
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f"Processing error: {str(e)}"
+        }
+
+
 def process_hide(container_b64: str, secret_b64: str, method: str, password: str = "",
                  original_filename: str = "", file_extension: str = "") -> dict:
-    """Process hide request from frontend"""
+    """Process hide request from frontend (base64 in, base64 out)"""
     try:
         container_data = base64.b64decode(container_b64)
         secret_data = base64.b64decode(secret_b64)
-
-        result = backend.process_hide_request(container_data, secret_data, method, password,
-                                              original_filename, file_extension)
-        return result
-
     except Exception as e:
         return {
             'success': False,
             'error': f"Processing error: {str(e)}"
         }
+    return _encode_result(
+        hide_file(container_data, secret_data, method, password, original_filename, file_extension),
+        'stego_data'
+    )
 
 
 def process_extract(stego_b64: str, password: str = "") -> dict:
-    """Process extract request from frontend"""
+    """Process extract request from frontend (base64 in, base64 out)"""
     try:
         stego_data = base64.b64decode(stego_b64)
-
-        # Try to auto-detect method
-        result = backend.process_extract_request(stego_data, 'auto', password)
-        return result
-
     except Exception as e:
         return {
             'success': False,
             'error': f"Processing error: {str(e)}"
         }
+    return _encode_result(extract_file(stego_data, password), 'extracted_data')
 
 
-def get_file_info(file_b64: str, filename: str) -> dict:
-    """Get file information"""
+def get_file_info(file_b64, filename: str) -> dict:
+    """Get file information (base64 string or binary file-like input)"""
     try:
-        file_data = base64.b64decode(file_b64)
-        return backend.get_file_info(file_data, filename)
+        file_data = _read_input(file_b64)
+
+        key = ('info', _digest(file_data), filename.rsplit('.', 1)[-1].lower())
+        return _memoized(key, lambda: _get_backend().get_file_info(file_data, filename))
     except Exception as e:
         return {
             'error': f"Failed to get file info: {str(e)}"
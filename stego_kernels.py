@@ -0,0 +1,25 @@
+"""Optional Numba kernels for stego_backend.
+
+Imported lazily on the first embed, so processes that never hide data do
+not pay for importing numba or loading compiled code. Importing this
+module raises ImportError when numba is not installed.
+"""
+from numba import njit, types
+
+# Carriers are 1-D uint8 arrays of any layout (audio uses a strided view);
+# the eager signature compiles on import, cache=True keeps the machine code on disk.
+_U8 = types.Array(types.uint8, 1, 'A')
+_U8_RO = types.Array(types.uint8, 1, 'A', readonly=True)
+
+
+@njit(types.void(_U8, _U8_RO), cache=True)
+def lsb_hide(carrier, data):
+    """Write the bits of data (MSB first) into the LSBs of the carrier, in place.
+
+    Bits are unpacked on the fly instead of materializing an 8x bit array.
+    """
+    for i in range(data.size):
+        byte = data[i]
+        base = i * 8
+        for k in range(8):
+            carrier[base + k] = (carrier[base + k] & 0xFE) | ((byte >> (7 - k)) & 1)